@@ -1,5 +1,8 @@
+import copy
 import multiprocessing
+import signal
 import unittest
+import django
 from django.conf import settings
 from django.db.models import Max
 from django.db import models
@@ -21,15 +24,54 @@ DJANGO_DAG_BACKEND = None
 if hasattr(settings, 'DJANGO_DAG_BACKEND'):
     DJANGO_DAG_BACKEND = settings.DJANGO_DAG_BACKEND
 
+# Queries issued by DagStructureTests.build_structure(), each new edge runs a
+# cycle check whose cost depends on the backend
+if DJANGO_DAG_BACKEND and DJANGO_DAG_BACKEND.endswith('djangocte'):
+    BUILD_STRUCTURE_QUERIES = 104
+else:
+    BUILD_STRUCTURE_QUERIES = 116
+
 
 class NodeStorage():
     pass
 
 
-class DagTestCase(TestCase):
+def create_nodes(model, storage, numbers):
+    """
+    Create a node named after each number with a single insert, and attach
+    them to the storage as pN
+    """
+    nodes = model.objects.bulk_create([model(name=str(i)) for i in numbers])
+    if nodes and nodes[0].pk is None:
+        # The backend can't return pks from a bulk insert, the new rows are
+        # the ones with the highest pks
+        nodes = list(model.objects.order_by('-pk')[:len(nodes)])[::-1]
+    for i, n in zip(numbers, nodes):
+        setattr(storage, f"p{i}", n)
+
+
+class NodeFixtureTestCase(TestCase):
+    """
+    Django before 3.2 shares the setUpTestData() attributes between tests,
+    so the node fixtures named in node_fixtures are copied for each test to
+    keep changes made in memory within it
+
+    Fixtures that only need edges in place bulk insert them rather than
+    calling add_child(), which has its own tests
+    """
+    node_fixtures = ('nodes',)
+
     def setUp(self):
-        for i in range(1, 11):
-            BasicNode(name="%s" % i).save()
+        super().setUp()
+        if django.VERSION < (3, 2):
+            for name in self.node_fixtures:
+                setattr(self, name, copy.deepcopy(getattr(self, name)))
+
+
+class DagTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        BasicNode.objects.bulk_create([BasicNode(name=str(i)) for i in range(1, 11)])
 
     def test_base_manager_management_with_unrelated_managers(self,):
         class UnrelatedManager:
@@ -90,15 +132,15 @@ class DagTestCase(TestCase):
             # results for intermediate nodes need to be cached
             n = 20
 
+            nodes = []
             for i in range(2 * n):
-                BasicNode(pk=i).save()
+                node = BasicNode(name=str(i))
+                node.save()
+                nodes.append(node)
 
             # Create edges
             for i in range(0, 2 * n - 2, 2):
-                p1 = BasicNode.objects.get(pk=i)
-                p2 = BasicNode.objects.get(pk=i + 1)
-                p3 = BasicNode.objects.get(pk=i + 2)
-                p4 = BasicNode.objects.get(pk=i + 3)
+                p1, p2, p3, p4 = nodes[i:i + 4]
 
                 p1.add_child(p3)
                 p1.add_child(p4)
@@ -106,15 +148,28 @@ class DagTestCase(TestCase):
                 p2.add_child(p4)
 
             # Compute descendants of a root node
-            BasicNode.objects.get(pk=0).descendants
+            nodes[0].descendants
 
             # Compute ancestors of a leaf node
-            BasicNode.objects.get(pk=2 * n - 1).ancestors
+            nodes[-1].ancestors
 
-            BasicNode.objects.get(pk=0).add_child(
-                BasicNode.objects.get(pk=2 * n - 1))
+            nodes[0].add_child(nodes[-1])
 
         # Run the test, raising an error if the code times out
+        if multiprocessing.current_process().daemon:
+            # Workers of the parallel test runner can't start a child process,
+            # so run inline and interrupt the test with an alarm
+            def timed_out(signum, frame):
+                raise RuntimeError('Graph operations take too long!')
+
+            previous_handler = signal.signal(signal.SIGALRM, timed_out)
+            signal.setitimer(signal.ITIMER_REAL, 10)
+            try:
+                run_test()
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+            return
         p = multiprocessing.Process(target=run_test)
         p.start()
         p.join(10)
@@ -124,16 +179,15 @@ class DagTestCase(TestCase):
             raise RuntimeError('Graph operations take too long!')
 
 
-class DagEdgeSaveTests(TestCase):
+class DagEdgeSaveTests(NodeFixtureTestCase):
     """
     Tests requiring the Edges save to return itself
     """
 
-    def setUp(self):
-        self.nodes = NodeStorage()
-        for i in range(1, 12):
-            BasicNodeES(name="%s" % i).save()
-            setattr(self.nodes, "p%s" % i, BasicNodeES.objects.get(pk=i))
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes = NodeStorage()
+        create_nodes(BasicNodeES, cls.nodes, range(1, 12))
 
     def test_correct_edge_is_return_on_add_child(self):
         """Test we return the edge on joining nodes, if the edge's save returns it"""
@@ -150,12 +204,11 @@ class DagEdgeSaveTests(TestCase):
         self.assertEqual(self.nodes.p5, edge.child)
 
 
-class DagRelationshipTests(TestCase):
-    def setUp(self):
-        self.nodes = NodeStorage()
-        for i in range(1, 12):
-            BasicNode(name="%s" % i).save()
-            setattr(self.nodes, "p%s" % i, BasicNode.objects.get(pk=i))
+class DagRelationshipTests(NodeFixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes = NodeStorage()
+        create_nodes(BasicNode, cls.nodes, range(1, 12))
 
     def test_can_add_a_child(self):
         """Test we can add a child to a node to form a simple dag/tree"""
@@ -269,37 +322,42 @@ class DagRelationshipTests(TestCase):
             'test_name')
 
 
-class DagStructureTests(TestCase):
+class DagStructureTests(NodeFixtureTestCase):
     nodeToTest = BasicNode
     edgeToTest = BasicEdge
 
-    def setUp(self,):
-        self.nodes = NodeStorage()
+    @classmethod
+    def setUpTestData(cls):
+        # Shared by all the subclasses, which only override nodeToTest and
+        # edgeToTest
+        cls.nodes = NodeStorage()
         for i in range(1, 12):
-            self.nodeToTest(name="%s" % i).save()
-            setattr(self.nodes, "p%s" % i, self.nodeToTest.objects.get(pk=i))
-        self.build_structure()
+            n = cls.nodeToTest(name=str(i))
+            n.save()
+            setattr(cls.nodes, f"p{i}", n)
+        cls.build_structure(cls.nodes)
 
-    def build_structure(self,):
+    @classmethod
+    def build_structure(cls, nodes):
         for a in range(0, 20):
             # shift id of edge:
-            self.nodes.p1.add_child(self.nodes.p2)
-            self.nodes.p1.remove_child(self.nodes.p2)
+            nodes.p1.add_child(nodes.p2)
+            nodes.p1.remove_child(nodes.p2)
 
-        self.nodes.p1.add_child(self.nodes.p5)
-        self.nodes.p5.add_child(self.nodes.p7)
-        self.nodes.p1.add_child(self.nodes.p6)
-        self.nodes.p6.add_child(self.nodes.p7)
+        nodes.p1.add_child(nodes.p5)
+        nodes.p5.add_child(nodes.p7)
+        nodes.p1.add_child(nodes.p6)
+        nodes.p6.add_child(nodes.p7)
 
-        self.nodes.p2.add_child(self.nodes.p6)
-        self.nodes.p3.add_child(self.nodes.p7)
-        self.nodes.p6.add_child(self.nodes.p8)
-        self.nodes.p2.add_child(self.nodes.p8)
+        nodes.p2.add_child(nodes.p6)
+        nodes.p3.add_child(nodes.p7)
+        nodes.p6.add_child(nodes.p8)
+        nodes.p2.add_child(nodes.p8)
 
-        self.nodes.p6.add_parent(self.nodes.p4)
-        self.nodes.p9.add_parent(self.nodes.p3)
-        self.nodes.p9.add_parent(self.nodes.p6)
-        self.nodes.p9.add_child(self.nodes.p10)
+        nodes.p6.add_parent(nodes.p4)
+        nodes.p9.add_parent(nodes.p3)
+        nodes.p9.add_parent(nodes.p6)
+        nodes.p9.add_child(nodes.p10)
 
         # `-- <BasicNode: # 1>
         #     |-- <BasicNode: # 5>
@@ -327,6 +385,11 @@ class DagStructureTests(TestCase):
         #     `-- <BasicNode: # 9>
         #         `-- <BasicNode: # 10>
 
+    def test_build_structure_query_count(self,):
+        self.edgeToTest.objects.all().delete()
+        with self.assertNumQueries(BUILD_STRUCTURE_QUERIES):
+            self.build_structure(self.nodes)
+
     def expand_path(self, paths):
         return[
             [p.name for p in path] for path in paths
@@ -635,14 +698,12 @@ class DagStructureTests(TestCase):
         pass
 
 
-class NodeCoreSortRelationshipTests(TestCase):
+class NodeCoreSortRelationshipTests(NodeFixtureTestCase):
 
-    def setUp(self):
-        self.nodes = NodeStorage()
-        for i in range(1, 10):
-            n = BasicNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes = NodeStorage()
+        create_nodes(BasicNode, cls.nodes, range(1, 10))
         # `-- <BasicNode: # 1>
         #     `-- <BasicNode: # 3 >
         #     `-- <BasicNode: # 4 >
@@ -651,15 +712,15 @@ class NodeCoreSortRelationshipTests(TestCase):
         #     `-- <BasicNode: # 6 >
         #     `-- <BasicNode: # 8 >
         #     `-- <BasicNode: # 7 >
-        self.nodes.p1.add_child(self.nodes.p3)
-        self.nodes.p1.add_child(self.nodes.p4)
-        self.nodes.p1.add_child(self.nodes.p5)
-        self.nodes.p2.add_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p7)
-        self.nodes.p2.add_child(self.nodes.p8)
-        for k, n in self.nodes.__dict__.items():
-            if k.startswith('p'):
-                n.save()
+        nodes = cls.nodes
+        BasicEdge.objects.bulk_create([
+            BasicEdge(parent=nodes.p1, child=nodes.p3),
+            BasicEdge(parent=nodes.p1, child=nodes.p4),
+            BasicEdge(parent=nodes.p1, child=nodes.p5),
+            BasicEdge(parent=nodes.p2, child=nodes.p6),
+            BasicEdge(parent=nodes.p2, child=nodes.p7),
+            BasicEdge(parent=nodes.p2, child=nodes.p8),
+        ])
 
     def test_with_sort_query_return_nodes(self,):
         qs = BasicNode.objects
@@ -754,10 +815,7 @@ class NodeCoreSortRelationshipTests(TestCase):
         )
 
     def test_queryset_sortting_filter(self):
-        for i in range(10, 16):
-            n = BasicNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
+        create_nodes(BasicNode, self.nodes, range(10, 16))
         self.nodes.p4.add_child(self.nodes.p10)
         self.nodes.p4.add_child(self.nodes.p11)
         self.nodes.p10.add_child(self.nodes.p12)
@@ -1,104 +1,90 @@
 import unittest
-from django.test import TestCase
 from ..models.inherited import (
     BaseDerivedNode, DerivedNodeA, DerivedNodeB, DerivedEdge,
     InheritedConcreteNode, InheritedConcreteEdge,
     InheritedAbstractNode, InheritedAbstractEdge
 )
-from .test_basic import DagStructureTests
-
-
-class NodeStorage():
-    pass
+from .test_basic import DagStructureTests, NodeFixtureTestCase, BUILD_STRUCTURE_QUERIES
 
 
 class DagStructureTestsInherited(DagStructureTests):
     nodeToTest = InheritedAbstractNode
     edgeToTest = InheritedAbstractEdge
 
-    def setUp(self,):
-        self.nodes = NodeStorage()
-        for i in range(1, 12):
-            n = InheritedAbstractNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.build_structure()
-
 
 class DagStructureTestsConcreteInherited(DagStructureTests):
     nodeToTest = InheritedConcreteNode
     edgeToTest = InheritedConcreteEdge
 
-    def setUp(self,):
-        self.nodes = NodeStorage()
-        for i in range(1, 12):
-            n = InheritedConcreteNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.build_structure()
-
 
 @unittest.skip("Most of these fail because the tree walker returns the basenode")
 class DagStructureTestsDerivedA(DagStructureTests):
+    # The class level skip stops unittest running setUpClass/setUp, so no
+    # fixture is built for it; the base class fixture is used once enabled
     nodeToTest = DerivedNodeA
     edgeToTest = DerivedEdge
 
-    def setUp(self,):
-        self.nodes = NodeStorage()
-        for i in range(1, 12):
-            n = DerivedNodeA(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
 
+class DagStructureTestsDerivedMultiNode(NodeFixtureTestCase):
+    node_fixtures = ('nodes_a', 'nodes_b')
 
-class DagStructureTestsDerivedMultiNode(TestCase):
-    def setUp(self,):
-        self.nodes = NodeStorage()
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes_a = {}
         for i in range(1, 12):
-            DerivedNodeA(name="%s" % i).save()
-            setattr(self.nodes, "pA%s" % i, DerivedNodeA.objects.get(pk=i))
+            n = DerivedNodeA(name=str(i))
+            n.save()
+            cls.nodes_a[i] = n
+        cls.nodes_b = {}
         for i in range(12, 24):
-            DerivedNodeB(name="%s" % i).save()
-            setattr(self.nodes, "pB%s" % i, DerivedNodeB.objects.get(pk=i))
-        self.build_structure()
+            n = DerivedNodeB(name=str(i))
+            n.save()
+            cls.nodes_b[i] = n
+        cls.build_structure(cls.nodes_a)
 
-    def build_structure(self,):
-        for a in range(0, 20):
+    @classmethod
+    def build_structure(cls, a):
+        for _ in range(0, 20):
             # Shift id of edge:
-            self.nodes.pA1.add_child(self.nodes.pA2)
-            self.nodes.pA1.remove_child(self.nodes.pA2)
+            a[1].add_child(a[2])
+            a[1].remove_child(a[2])
+
+        a[1].add_child(a[5])
+        a[5].add_child(a[7])
+        a[1].add_child(a[6])
+        a[6].add_child(a[7])
 
-        self.nodes.pA1.add_child(self.nodes.pA5)
-        self.nodes.pA5.add_child(self.nodes.pA7)
-        self.nodes.pA1.add_child(self.nodes.pA6)
-        self.nodes.pA6.add_child(self.nodes.pA7)
+        a[2].add_child(a[6])
+        a[3].add_child(a[7])
+        a[6].add_child(a[8])
+        a[2].add_child(a[8])
 
-        self.nodes.pA2.add_child(self.nodes.pA6)
-        self.nodes.pA3.add_child(self.nodes.pA7)
-        self.nodes.pA6.add_child(self.nodes.pA8)
-        self.nodes.pA2.add_child(self.nodes.pA8)
+        a[6].add_parent(a[4])
+        a[9].add_parent(a[3])
+        a[9].add_parent(a[6])
+        a[9].add_child(a[10])
 
-        self.nodes.pA6.add_parent(self.nodes.pA4)
-        self.nodes.pA9.add_parent(self.nodes.pA3)
-        self.nodes.pA9.add_parent(self.nodes.pA6)
-        self.nodes.pA9.add_child(self.nodes.pA10)
+    def test_build_structure_query_count(self,):
+        DerivedEdge.objects.all().delete()
+        with self.assertNumQueries(BUILD_STRUCTURE_QUERIES):
+            self.build_structure(self.nodes_a)
 
     def test_model_node_type(self,):
         self.assertEqual(
-            self.nodes.pA1.get_node_model(),
+            self.nodes_a[1].get_node_model(),
             BaseDerivedNode
         )
         self.assertEqual(
-            self.nodes.pB12.get_node_model(),
+            self.nodes_b[12].get_node_model(),
             BaseDerivedNode
         )
 
     def test_model_edge_type(self,):
         self.assertEqual(
-            self.nodes.pA1.get_edge_model(),
+            self.nodes_a[1].get_edge_model(),
             DerivedEdge
         )
         self.assertEqual(
-            self.nodes.pB12.get_edge_model(),
+            self.nodes_b[12].get_edge_model(),
             DerivedEdge
         )
@@ -1,65 +1,94 @@
 from django_dag.models.order_control import Position
 import unittest
-from django.conf import settings
-from django.test import TestCase
 from django.db import NotSupportedError
 from django.db.models import TextField
 from django.db.models.expressions import F, Value
 from django.db.models.functions import Cast, Concat, RPad
 
 from ..models.ordered import EdgeOrderedNode, OrderedEdge
-from ..models.ordered import OrderedNode
+from ..models.ordered import OrderedNode, NodeOrderedEdge
 
 from django_dag.exceptions import InvalidNodeMove
 from django_dag.models import DagSortOrder
-
-DJANGO_DAG_BACKEND = None
-if hasattr(settings, 'DJANGO_DAG_BACKEND'):
-    DJANGO_DAG_BACKEND = settings.DJANGO_DAG_BACKEND
-
-
-class NodeStorage():
-    pass
-
-
-class DagOrderingBasicTests(TestCase):
-    def setUp(self):
-        self.nodes_eo = NodeStorage()
-        for i in range(1, 10):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes_eo, "p%s" % i, n)
-
-        self.nodes_no = NodeStorage()
-        for i in range(1, 10):
-            e = EdgeOrderedNode(name="%s" % i)
-            e.save()
-            setattr(self.nodes_no, "p%s" % i, e)
+from .test_basic import NodeStorage, NodeFixtureTestCase, create_nodes, DJANGO_DAG_BACKEND
+
+# Queries issued building and fetching the sorted querysets, the standard
+# backend walks the graph to build the sort paths so its cost grows with the
+# fixture while the djangocte backend runs a single recursive query.
+# EDGE_SORT_BUILD_QUERIES counts the build alone, without the fetch
+if DJANGO_DAG_BACKEND and DJANGO_DAG_BACKEND.endswith('djangocte'):
+    EDGE_SORT_QUERIES = 1
+    EDGE_SORT_BUILD_QUERIES = 0
+    EDGE_SORT_CLONED_QUERIES = 1
+    EDGE_SORT_TWICE_QUERIES = 2
+    NODE_SORT_QUERIES = 1
+    NODE_SORT_CLONED_QUERIES = 1
+else:
+    EDGE_SORT_QUERIES = 20
+    EDGE_SORT_BUILD_QUERIES = 19
+    EDGE_SORT_CLONED_QUERIES = 24
+    EDGE_SORT_TWICE_QUERIES = 37
+    NODE_SORT_QUERIES = 18
+    NODE_SORT_CLONED_QUERIES = 20
+
+
+def _ordered_child_pks(node):
+    """
+    Fetch the pks of the children of node in sequence order
+    """
+    return list(node.children.with_sequence().order_by('sequence').values_list('pk', flat=True))
+
+
+def _parent_pks(node):
+    """
+    Fetch the pks of the parents of node
+    """
+    return list(node.parents.values_list('pk', flat=True))
+
+
+def _all_edges():
+    """
+    Fetch every edge as (parent name, child name, sequence); the rows are
+    unordered, so compare them with assertCountEqual
+    """
+    return list(OrderedEdge.objects.values_list('parent__name', 'child__name', 'sequence'))
+
+
+class DagOrderingBasicTests(NodeFixtureTestCase):
+    node_fixtures = ('nodes_eo', 'nodes_no')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes_eo = NodeStorage()
+        create_nodes(EdgeOrderedNode, cls.nodes_eo, range(1, 10))
+
+        cls.nodes_no = NodeStorage()
+        create_nodes(EdgeOrderedNode, cls.nodes_no, range(1, 10))
 
     def test_can_add_a_child_with_edge_order(self):
-        self.nodes_eo.p1.add_child(self.nodes_eo.p5, sequence=12)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p6, sequence=8)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p7, sequence=4)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p5, sequence=1)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p6, sequence=7)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p7, sequence=5)
-        self.assertEqual(OrderedEdge.objects.all().count(), 6)
-        self.assertEqual(
-            list(OrderedEdge.objects.all().order_by('parent__name', 'child__name').values_list(
-                'parent__name', 'child__name', 'sequence')
-            ),
+        nodes = self.nodes_eo
+        p1, p2, p5, p6, p7 = nodes.p1, nodes.p2, nodes.p5, nodes.p6, nodes.p7
+        p1.add_child(p5, sequence=12)
+        p1.add_child(p6, sequence=8)
+        p1.add_child(p7, sequence=4)
+        p2.add_child(p5, sequence=1)
+        p2.add_child(p6, sequence=7)
+        p2.add_child(p7, sequence=5)
+        edges = _all_edges()
+        self.assertCountEqual(
+            edges,
             [('1', '5', 12), ('1', '6', 8), ('1', '7', 4), ('2', '5', 1), ('2', '6', 7), ('2', '7', 5)])
 
     def test_can_add_a_child_with_overlapping_edge_orders(self):
-        self.nodes_eo.p1.add_child(self.nodes_eo.p5, sequence=12)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p6, sequence=8)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p5, sequence=8)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p6, sequence=12)
-        self.assertEqual(OrderedEdge.objects.all().count(), 4)
-        self.assertEqual(
-            list(OrderedEdge.objects.all().order_by('parent__name', 'child__name').values_list(
-                'parent__name', 'child__name', 'sequence')
-            ),
+        nodes = self.nodes_eo
+        p1, p2, p5, p6 = nodes.p1, nodes.p2, nodes.p5, nodes.p6
+        p1.add_child(p5, sequence=12)
+        p1.add_child(p6, sequence=8)
+        p2.add_child(p5, sequence=8)
+        p2.add_child(p6, sequence=12)
+        edges = _all_edges()
+        self.assertCountEqual(
+            edges,
             [('1', '5', 12), ('1', '6', 8), ('2', '5', 8), ('2', '6', 12)])
 
     @unittest.skip('No support for add_child setting sequence on node')
@@ -67,36 +96,35 @@ class DagOrderingBasicTests(TestCase):
         pass
 
     def test_can_use_node_insert_after_at_ends_uses_key_next(self):
-        self.nodes_eo.p1.add_child(self.nodes_eo.p6, sequence=8)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p7, sequence=4)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p5, sequence=1)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p6, sequence=7)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p7, sequence=5)
-
-        self.nodes_eo.p1.insert_child_after(self.nodes_eo.p5, self.nodes_eo.p6)
-
-        self.assertEqual(OrderedEdge.objects.all().count(), 6)
-        self.assertEqual(
-            list(OrderedEdge.objects.all().order_by('parent__name', 'child__name').values_list(
-                'parent__name', 'child__name', 'sequence')
-            ),
+        nodes = self.nodes_eo
+        p1, p2, p5, p6, p7 = nodes.p1, nodes.p2, nodes.p5, nodes.p6, nodes.p7
+        p1.add_child(p6, sequence=8)
+        p1.add_child(p7, sequence=4)
+        p2.add_child(p5, sequence=1)
+        p2.add_child(p6, sequence=7)
+        p2.add_child(p7, sequence=5)
+
+        p1.insert_child_after(p5, p6)
+
+        edges = _all_edges()
+        self.assertCountEqual(
+            edges,
             [('1', '5', 54), ('1', '6', 8), ('1', '7', 4), ('2', '5', 1), ('2', '6', 7), ('2', '7', 5)])
 
     def test_can_use_node_insert_before_at_start_uses_key_next(self):
-        self.nodes_eo.p1.add_child(self.nodes_eo.p5, sequence=12)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p6, sequence=8)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p5, sequence=1)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p6, sequence=7)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p7, sequence=5)
-
-        self.nodes_eo.p1.insert_child_before(
-            self.nodes_eo.p7, self.nodes_eo.p6)
-
-        self.assertEqual(OrderedEdge.objects.all().count(), 6)
-        self.assertEqual(
-            list(OrderedEdge.objects.all().order_by('parent__name', 'child__name').values_list(
-                'parent__name', 'child__name', 'sequence')
-            ),
+        nodes = self.nodes_eo
+        p1, p2, p5, p6, p7 = nodes.p1, nodes.p2, nodes.p5, nodes.p6, nodes.p7
+        p1.add_child(p5, sequence=12)
+        p1.add_child(p6, sequence=8)
+        p2.add_child(p5, sequence=1)
+        p2.add_child(p6, sequence=7)
+        p2.add_child(p7, sequence=5)
+
+        p1.insert_child_before(p7, p6)
+
+        edges = _all_edges()
+        self.assertCountEqual(
+            edges,
             [('1', '5', 12), ('1', '6', 8), ('1', '7', 4), ('2', '5', 1), ('2', '6', 7), ('2', '7', 5)])
 
     @unittest.skip('no exception or test written as yet')
@@ -112,42 +140,39 @@ class DagOrderingBasicTests(TestCase):
         pass
 
     def test_can_use_node_insert_after_uses_key_between(self):
-        self.nodes_eo.p1.add_child(self.nodes_eo.p5, sequence=12)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p7, sequence=4)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p5, sequence=1)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p6, sequence=7)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p7, sequence=5)
-        self.nodes_eo.p1.insert_child_after(self.nodes_eo.p6, self.nodes_eo.p7)
-        self.assertEqual(OrderedEdge.objects.all().count(), 6)
-        self.assertEqual(
-            list(OrderedEdge.objects.all().order_by('parent__name', 'child__name').values_list(
-                'parent__name', 'child__name', 'sequence')
-            ),
+        nodes = self.nodes_eo
+        p1, p2, p5, p6, p7 = nodes.p1, nodes.p2, nodes.p5, nodes.p6, nodes.p7
+        p1.add_child(p5, sequence=12)
+        p1.add_child(p7, sequence=4)
+        p2.add_child(p5, sequence=1)
+        p2.add_child(p6, sequence=7)
+        p2.add_child(p7, sequence=5)
+        p1.insert_child_after(p6, p7)
+        edges = _all_edges()
+        self.assertCountEqual(
+            edges,
             [('1', '5', 12), ('1', '6', 8), ('1', '7', 4), ('2', '5', 1), ('2', '6', 7), ('2', '7', 5)])
 
     def test_can_use_node_insert_before_uses_key_between(self):
-        self.nodes_eo.p1.add_child(self.nodes_eo.p5, sequence=12)
-        self.nodes_eo.p1.add_child(self.nodes_eo.p7, sequence=4)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p5, sequence=1)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p6, sequence=7)
-        self.nodes_eo.p2.add_child(self.nodes_eo.p7, sequence=5)
-        self.nodes_eo.p1.insert_child_before(
-            self.nodes_eo.p6, self.nodes_eo.p5)
-        self.assertEqual(OrderedEdge.objects.all().count(), 6)
-        self.assertEqual(
-            list(OrderedEdge.objects.all().order_by('parent__name', 'child__name').values_list(
-                'parent__name', 'child__name', 'sequence')
-            ),
+        nodes = self.nodes_eo
+        p1, p2, p5, p6, p7 = nodes.p1, nodes.p2, nodes.p5, nodes.p6, nodes.p7
+        p1.add_child(p5, sequence=12)
+        p1.add_child(p7, sequence=4)
+        p2.add_child(p5, sequence=1)
+        p2.add_child(p6, sequence=7)
+        p2.add_child(p7, sequence=5)
+        p1.insert_child_before(p6, p5)
+        edges = _all_edges()
+        self.assertCountEqual(
+            edges,
             [('1', '5', 12), ('1', '6', 8), ('1', '7', 4), ('2', '5', 1), ('2', '6', 7), ('2', '7', 5)])
 
 
-class EdgeSortedDagRelationshipTests(TestCase):
-    def setUp(self):
-        self.nodes = NodeStorage()
-        for i in range(1, 10):
-            e = EdgeOrderedNode(name="%s" % i)
-            e.save()
-            setattr(self.nodes, "p%s" % i, e)
+class EdgeSortedDagTestCase(NodeFixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes = NodeStorage()
+        create_nodes(EdgeOrderedNode, cls.nodes, range(1, 10))
         # `-- <BasicNode: # 1>
         #     `--  4 -- <BasicNode: # 7 o1>
         #     `--  8 -- <BasicNode: # 6 o2>
@@ -157,406 +182,18 @@ class EdgeSortedDagRelationshipTests(TestCase):
         #     `--  4 -- <BasicNode: # 7 o2>
         #     `--  8 -- <BasicNode: # 6 o3>
 
-        self.nodes.p1.add_child(self.nodes.p5, sequence=12)
-        self.nodes.p1.add_child(self.nodes.p6, sequence=8)
-        self.nodes.p1.add_child(self.nodes.p7, sequence=4)
-        self.nodes.p2.add_child(self.nodes.p5, sequence=1)
-        self.nodes.p2.add_child(self.nodes.p6, sequence=8)
-        self.nodes.p2.add_child(self.nodes.p7, sequence=4)
-
-    def test_queryset_sortting_filter_mixed(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
-        with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_PK,
-                padsize=2,
-            )
-            qs_sorted = qs_sorted.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=2,
-            ).order_by('dag_pk_path')
-            self.assertEqual(
-                tuple(
-                    qs_sorted.values_list(
-                        'pk',
-                        'dag_sequence_path',
-                        'dag_pk_path',
-                    )
-                ),
-                (
-                    (1, '01', '01'),
-                    (5, '01,12', '01,05'),
-                    (6, '01,08', '01,06'),
-                    (10, '01,08,50', '01,06,10'),
-                    (12, '01,08,50,50', '01,06,10,12'),
-                    (11, '01,08,75', '01,06,11'),
-                    (7, '01,04', '01,07'),
-                    (2, '02', '02'),
-                    (3, '02,09', '02,03'),
-                    (13, '02,09,06', '02,03,13'),
-                    (5, '02,01', '02,05'),
-                    (7, '02,04', '02,07'),
-                    (4, '04', '04'),
-                    (8, '08', '08'),
-                    (9, '09', '09'),
-                    (14, '14', '14'),
-                    (15, '15', '15')
-                )
-            )
-
-    def test_queryset_sortting_filter_node_distinct(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-        expected_nodes = (
-            (1, '0001',),
-            (5, '0001,0005'),
-            (6, '0001,0006'),
-            (10, '0001,0006,0010'),
-            (12, '0001,0006,0010,0012'),
-            (11, '0001,0006,0011'),
-            (7, '0001,0007'),
-            (2, '0002'),
-            (3, '0002,0003'),
-            (13, '0002,0003,0013'),
-            (4, '0004'),
-            (8, '0008'),
-            (9, '0009'),
-            (14, '0014'),
-            (15, '0015')
-        )
-        qs = EdgeOrderedNode.objects.all()
-        with self.subTest(msg="query sort order same as visit sort"):
-            qs_sorted = qs.with_sort_sequence(
-                padsize=2,
-            ).distinct_node(
-                'dag_node_path'
-            ).order_by('dag_node_path')
-            self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_node_path')),
-                expected_nodes
-            )
-        with self.subTest(msg="query sort order reverse to filter order"):
-            qs_sorted = qs.with_sort_sequence(
-                padsize=2,
-            ).distinct_node(
-                'dag_node_path'
-            ).order_by('-dag_node_path')
-            self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_node_path')),
-                tuple(reversed(expected_nodes))
-            )
-
-    def test_queryset_sortting_filter_node_distinct_returns_nodes(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-        qs = EdgeOrderedNode.objects.all()
-        qs_sorted = qs.with_sort_sequence(
-            padsize=2,
-        ).distinct_node('dag_node_path')
-        for node in qs_sorted:
-            self.assertIsInstance(node, EdgeOrderedNode)
-
-    def test_queryset_sortting_filter_node_distinct_without_sort(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-        qs = EdgeOrderedNode.objects.all()
-        with self.assertRaises(NotSupportedError):
-            list(qs.distinct_node('dag_node_path'))
-
-    def test_queryset_sortting_filter_breathfirst(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
-        with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                padsize=2,
-            ).order_by('dag_depth', 'dag_sequence_path')
-            self.assertEqual(
-                tuple(
-                    map(
-                        lambda row: row[: 2],
-                        qs_sorted.values_list('pk', 'dag_sequence_path', 'dag_depth')
-                    )
-                ),
-                (
-                    (1, '01'),
-                    (2, '02'),
-                    (4, '04'),
-                    (8, '08'),
-                    (9, '09'),
-                    (14, '14'),
-                    (15, '15'),
-                    (7, '01,04'),
-                    (6, '01,08'),
-                    (5, '01,12'),
-                    (5, '02,01'),
-                    (7, '02,04'),
-                    (3, '02,09'),
-                    (10, '01,08,50'),
-                    (11, '01,08,75'),
-                    (13, '02,09,06'),
-                    (12, '01,08,50,50'),
-                )
-            )
-
-    def test_queryset_sortting_filter_pk_path(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
-        with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_PK,
-                padsize=2,
-            ).order_by('dag_pk_path')
-
-            self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_pk_path')),
-                (
-                    (1, '01',),
-                    (5, '01,05'),
-                    (6, '01,06'),
-                    (10, '01,06,10'),
-                    (12, '01,06,10,12'),
-                    (11, '01,06,11'),
-                    (7, '01,07'),
-                    (2, '02'),
-                    (3, '02,03'),
-                    (13, '02,03,13'),
-                    (5, '02,05'),
-                    (7, '02,07'),
-                    (4, '04'),
-                    (8, '08'),
-                    (9, '09'),
-                    (14, '14'),
-                    (15, '15')
-                )
-            )
-
-    def test_queryset_sortting_filter_default(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
+        nodes = cls.nodes
+        OrderedEdge.objects.bulk_create([
+            OrderedEdge(parent=nodes.p1, child=nodes.p5, sequence=12),
+            OrderedEdge(parent=nodes.p1, child=nodes.p6, sequence=8),
+            OrderedEdge(parent=nodes.p1, child=nodes.p7, sequence=4),
+            OrderedEdge(parent=nodes.p2, child=nodes.p5, sequence=1),
+            OrderedEdge(parent=nodes.p2, child=nodes.p6, sequence=8),
+            OrderedEdge(parent=nodes.p2, child=nodes.p7, sequence=4),
+        ])
 
-        with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                padsize=2,
-            ).order_by('dag_sequence_path')
-            self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_sequence_path')),
-                (
-                    (1, '01'),
-                    (7, '01,04'),
-                    (6, '01,08'),
-                    (10, '01,08,50'),
-                    (12, '01,08,50,50'),
-                    (11, '01,08,75'),
-                    (5, '01,12'),
-                    (2, '02'),
-                    (5, '02,01'),
-                    (7, '02,04'),
-                    (3, '02,09'),
-                    (13, '02,09,06'),
-                    (4, '04'),
-                    (8, '08'),
-                    (9, '09'),
-                    (14, '14'),
-                    (15, '15')
-                )
-            )
-
-    def test_queryset_sortting_filter_depthfirst_preorder(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
-        with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=2,
-            ).order_by('dag_sequence_path')
-            self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_sequence_path')),
-                (
-                    (1, '01'),
-                    (7, '01,04'),
-                    (6, '01,08'),
-                    (10, '01,08,50'),
-                    (12, '01,08,50,50'),
-                    (11, '01,08,75'),
-                    (5, '01,12'),
-                    (2, '02'),
-                    (5, '02,01'),
-                    (7, '02,04'),
-                    (3, '02,09'),
-                    (13, '02,09,06'),
-                    (4, '04'),
-                    (8, '08'),
-                    (9, '09'),
-                    (14, '14'),
-                    (15, '15')
-                )
-            )
-        with self.subTest(msg="with cloned nodes"):
-            self.nodes.p2.insert_child_after(self.nodes.p6, self.nodes.p5)
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=2,
-            ).order_by('dag_sequence_path')
-            self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_sequence_path')),
-                (
-                    (1, '01'),
-                    (7, '01,04'),
-                    (6, '01,08'),
-                    (10, '01,08,50'),
-                    (12, '01,08,50,50'),
-                    (11, '01,08,75'),
-                    (5, '01,12'),
-                    (2, '02'),
-                    (5, '02,01'),
-                    (6, '02,02'),
-                    (10, '02,02,50'),
-                    (12, '02,02,50,50'),
-                    (11, '02,02,75'),
-                    (7, '02,04'),
-                    (3, '02,09'),
-                    (13, '02,09,06'),
-                    (4, '04'),
-                    (8, '08'),
-                    (9, '09'),
-                    (14, '14'),
-                    (15, '15')
-                )
-            )
-
-    def test_queryset_sortting_filter_depthfirst_postorder(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
-        with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                padsize=2,
-            ).annotate(
-                dag_postorder_path=RPad(
-                    Concat(
-                        Cast(F('dag_sequence_path'), output_field=TextField()),
-                        Value(','),
-                    ),
-                    (2 + 1) * 5,
-                    Value('A')
-                )
-            ).order_by('dag_postorder_path')
-            self.assertEqual(
-                tuple(
-                    map(
-                        lambda row: row[: 2],
-                        qs_sorted.values_list('pk', 'dag_sequence_path', 'dag_postorder_path')
-                    )
-                ),
-                (
-                    (7, '01,04'),
-                    (12, '01,08,50,50'),
-                    (10, '01,08,50'),
-                    (11, '01,08,75'),
-                    (6, '01,08'),
-                    (5, '01,12'),
-                    (1, '01'),
-                    (5, '02,01'),
-                    (7, '02,04'),
-                    (13, '02,09,06'),
-                    (3, '02,09'),
-                    (2, '02'),
-                    (4, '04'),
-                    (8, '08'),
-                    (9, '09'),
-                    (14, '14'),
-                    (15, '15'),
-                )
-            )
-
-    @unittest.skip('no exception or test written as yet')
-    def test_queryset_sortting_filter_depthfirst_inorder(self):
-        pass
 
+class EdgeSortedDagRelationshipTests(EdgeSortedDagTestCase):
     def test_children_ordered_filter(self):
         self.assertEqual(
             list(self.nodes.p1.children
@@ -584,46 +221,60 @@ class EdgeSortedDagRelationshipTests(TestCase):
             [('2', 1), ('1', 12)])
 
     def test_can_get_first_child_of_node(self):
-        self.assertEqual(self.nodes.p1.get_first_child(), self.nodes.p7)
-        self.assertEqual(self.nodes.p2.get_first_child(), self.nodes.p5)
+        with self.assertNumQueries(1):
+            first_child = self.nodes.p1.get_first_child()
+        self.assertEqual(first_child, self.nodes.p7)
+        first_child = self.nodes.p2.get_first_child()
+        self.assertEqual(first_child, self.nodes.p5)
         self.assertEqual(
-            self.nodes.p2.get_first_child(),
+            first_child,
             self.nodes.p2.children.with_sequence().order_by('sequence').first(),
         )
         self.assertEqual(self.nodes.p6.get_first_child(), None)
 
     def test_can_get_last_child_of_node(self):
-        self.assertEqual(self.nodes.p1.get_last_child(), self.nodes.p5)
-        self.assertEqual(self.nodes.p2.get_last_child(), self.nodes.p6)
+        with self.assertNumQueries(1):
+            last_child = self.nodes.p1.get_last_child()
+        self.assertEqual(last_child, self.nodes.p5)
+        last_child = self.nodes.p2.get_last_child()
+        self.assertEqual(last_child, self.nodes.p6)
         self.assertEqual(
-            self.nodes.p2.get_last_child(),
+            last_child,
             self.nodes.p2.children.with_sequence().order_by('sequence').last(),
         )
         self.assertEqual(self.nodes.p6.get_last_child(), None)
 
     def test_can_get_first_parent_of_node(self):
-        self.assertEqual(self.nodes.p5.get_first_parent(), self.nodes.p2)
+        with self.assertNumQueries(1):
+            first_parent = self.nodes.p5.get_first_parent()
+        self.assertEqual(first_parent, self.nodes.p2)
         # # FIXME: what should dup sequences reveal
         # self.assertEqual(self.nodes.p6.get_first_parent(), self.nodes.p1)
         self.assertEqual(
-            self.nodes.p5.get_first_parent(),
+            first_parent,
             self.nodes.p5.parents.with_sequence().order_by('sequence').first(),
         )
 
     def test_can_get_last_parent_of_node(self):
-        self.assertEqual(self.nodes.p5.get_last_parent(), self.nodes.p1)
+        with self.assertNumQueries(1):
+            last_parent = self.nodes.p5.get_last_parent()
+        self.assertEqual(last_parent, self.nodes.p1)
         # # FIXME: what should dup sequences reveal
         # self.assertEqual(self.nodes.p6.get_first_parent(), self.nodes.p1)
         self.assertEqual(
-            self.nodes.p5.get_last_parent(),
+            last_parent,
             self.nodes.p5.parents.with_sequence().order_by('sequence').last(),
         )
 
     def test_can_get_next_sibling_of_node(self):
-        self.assertEqual(
-            self.nodes.p6.get_next_sibling(self.nodes.p1),
-            self.nodes.p5)
-        self.assertEqual(self.nodes.p5.get_next_sibling(self.nodes.p1), None)
+        # EdgeOrderedNode's DagEdgeIntSorter overrides the sibling lookups,
+        # so these counts cover the test app's sorter, not the library's
+        with self.assertNumQueries(2):
+            sibling = self.nodes.p6.get_next_sibling(self.nodes.p1)
+        self.assertEqual(sibling, self.nodes.p5)
+        with self.assertNumQueries(2):
+            sibling = self.nodes.p5.get_next_sibling(self.nodes.p1)
+        self.assertEqual(sibling, None)
         self.assertEqual(
             self.nodes.p5.get_next_sibling(self.nodes.p2),
             self.nodes.p7)
@@ -631,10 +282,14 @@ class EdgeSortedDagRelationshipTests(TestCase):
             self.nodes.p6.get_next_sibling(self.nodes.p2), None)
 
     def test_can_get_prev_sibling_of_node(self):
-        self.assertEqual(self.nodes.p7.get_prev_sibling(self.nodes.p1), None)
-        self.assertEqual(
-            self.nodes.p5.get_prev_sibling(self.nodes.p1),
-            self.nodes.p6)
+        # EdgeOrderedNode's DagEdgeIntSorter overrides the sibling lookups,
+        # so these counts cover the test app's sorter, not the library's
+        with self.assertNumQueries(2):
+            sibling = self.nodes.p7.get_prev_sibling(self.nodes.p1)
+        self.assertEqual(sibling, None)
+        with self.assertNumQueries(2):
+            sibling = self.nodes.p5.get_prev_sibling(self.nodes.p1)
+        self.assertEqual(sibling, self.nodes.p6)
         self.assertEqual(
             self.nodes.p7.get_prev_sibling(self.nodes.p2),
             self.nodes.p5)
@@ -651,38 +306,24 @@ class EdgeSortedDagRelationshipTests(TestCase):
 
     def test_can_move_a_node_between_parents_default_location(self):
         self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
         )
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
 
     def test_can_move_a_node_between_parents_first(self):
         self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             position=Position.FIRST
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).first(),
+            _ordered_child_pks(self.nodes.p1)[0],
             self.nodes.p9.pk
         )
 
@@ -694,9 +335,7 @@ class EdgeSortedDagRelationshipTests(TestCase):
             position=Position.FIRST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).first(),
+            _ordered_child_pks(self.nodes.p1)[0],
             self.nodes.p9.pk
         )
 
@@ -707,31 +346,21 @@ class EdgeSortedDagRelationshipTests(TestCase):
             position=Position.FIRST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).first(),
+            _ordered_child_pks(self.nodes.p1)[0],
             self.nodes.p9.pk
         )
 
     def test_can_move_a_node_between_parents_last(self):
         self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             position=Position.LAST
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).last(),
+            _ordered_child_pks(self.nodes.p1)[-1],
             self.nodes.p9.pk
         )
 
@@ -743,9 +372,7 @@ class EdgeSortedDagRelationshipTests(TestCase):
             position=Position.LAST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).last(),
+            _ordered_child_pks(self.nodes.p1)[-1],
             self.nodes.p9.pk
         )
 
@@ -756,32 +383,22 @@ class EdgeSortedDagRelationshipTests(TestCase):
             position=Position.LAST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).last(),
+            _ordered_child_pks(self.nodes.p1)[-1],
             self.nodes.p9.pk
         )
 
     def test_can_move_a_node_between_parents_before(self):
         self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             destination_sibling=self.nodes.p6,
             position=Position.BEFORE
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
+            _ordered_child_pks(self.nodes.p1),
             [self.nodes.p7.pk, self.nodes.p9.pk,
                 self.nodes.p6.pk, self.nodes.p5.pk]
         )
@@ -795,9 +412,7 @@ class EdgeSortedDagRelationshipTests(TestCase):
             position=Position.BEFORE
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
+            _ordered_child_pks(self.nodes.p2),
             [self.nodes.p5.pk, self.nodes.p9.pk,
                 self.nodes.p7.pk, self.nodes.p6.pk]
         )
@@ -809,33 +424,23 @@ class EdgeSortedDagRelationshipTests(TestCase):
             self.nodes.p7,
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
+            _ordered_child_pks(self.nodes.p2),
             [self.nodes.p5.pk, self.nodes.p9.pk,
                 self.nodes.p7.pk, self.nodes.p6.pk]
         )
 
     def test_can_move_a_node_between_parents_after(self):
         self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             destination_sibling=self.nodes.p6,
             position=Position.AFTER
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
+            _ordered_child_pks(self.nodes.p1),
             [self.nodes.p7.pk, self.nodes.p6.pk,
                 self.nodes.p9.pk, self.nodes.p5.pk]
         )
@@ -849,102 +454,415 @@ class EdgeSortedDagRelationshipTests(TestCase):
             position=Position.AFTER
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
+            _ordered_child_pks(self.nodes.p2),
             [self.nodes.p5.pk, self.nodes.p7.pk,
                 self.nodes.p9.pk, self.nodes.p6.pk]
         )
 
-    def test_can_move_a_node_after_a_sibling_quickapi(self):
-        self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.nodes.p2.move_child_after(
-            self.nodes.p9,
-            self.nodes.p7,
-        )
-        self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p5.pk, self.nodes.p7.pk,
-                self.nodes.p9.pk, self.nodes.p6.pk]
-        )
+    def test_can_move_a_node_after_a_sibling_quickapi(self):
+        self.nodes.p2.add_child(self.nodes.p9, sequence=12)
+        self.nodes.p2.move_child_after(
+            self.nodes.p9,
+            self.nodes.p7,
+        )
+        self.assertEqual(
+            _ordered_child_pks(self.nodes.p2),
+            [self.nodes.p5.pk, self.nodes.p7.pk,
+                self.nodes.p9.pk, self.nodes.p6.pk]
+        )
+
+    def test_can_move_a_node_between_parents_beforestart(self):
+        self.nodes.p2.add_child(self.nodes.p9, sequence=12)
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
+        self.nodes.p9.move_node(
+            self.nodes.p2,
+            self.nodes.p1,
+            destination_sibling=self.nodes.p7,
+            position=Position.BEFORE
+        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
+        self.assertEqual(
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p9.pk, self.nodes.p7.pk,
+                self.nodes.p6.pk, self.nodes.p5.pk]
+        )
+
+    def test_can_move_a_node_between_parents_afterend(self):
+        self.nodes.p2.add_child(self.nodes.p9, sequence=12)
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
+        self.nodes.p9.move_node(
+            self.nodes.p2,
+            self.nodes.p1,
+            destination_sibling=self.nodes.p5,
+            position=Position.AFTER
+        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
+        self.assertEqual(
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p7.pk, self.nodes.p6.pk,
+                self.nodes.p5.pk, self.nodes.p9.pk]
+        )
+
+
+class ExtendedEdgeSortedDagRelationshipTests(EdgeSortedDagTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        create_nodes(EdgeOrderedNode, cls.nodes, range(10, 16))
+        # `-- <BasicNode: # 1>
+        #     `--  4 -- <BasicNode: # 7>
+        #     `--  8 -- <BasicNode: # 6>
+        #     |    `-- 50 -- <BasicNode: # 10>
+        #     |    |    `-- 50 -- <BasicNode: # 12>
+        #     |    `-- 75 -- <BasicNode: # 11>
+        #     `-- 12 -- <BasicNode: # 5>
+        # `-- <BasicNode: # 2>
+        #     `--  1 -- <BasicNode: # 5>
+        #     `--  4 -- <BasicNode: # 7>
+        #     `--  9 -- <BasicNode: # 3>
+        #          `--  6 -- <BasicNode: # 13>
+        cls.nodes.p6.insert_child_after(cls.nodes.p10, None)
+        cls.nodes.p6.insert_child_after(cls.nodes.p11, cls.nodes.p10)
+        cls.nodes.p10.insert_child_after(cls.nodes.p12, None)
+        cls.nodes.p2.remove_child(cls.nodes.p6)
+        cls.nodes.p2.add_child(cls.nodes.p3, sequence=9)
+        cls.nodes.p3.add_child(cls.nodes.p13, sequence=6)
+
+    def test_queryset_sortting_filter_mixed(self):
+        with self.subTest(msg="with no cloned nodes"):
+            with self.assertNumQueries(EDGE_SORT_TWICE_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_PK,
+                    padsize=2,
+                )
+                qs_sorted = qs_sorted.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=2,
+                ).order_by('dag_pk_path')
+                rows = tuple(
+                    qs_sorted.values_list(
+                        'pk',
+                        'dag_sequence_path',
+                        'dag_pk_path',
+                    )
+                )
+            self.assertEqual(
+                rows,
+                (
+                    (1, '01', '01'),
+                    (5, '01,12', '01,05'),
+                    (6, '01,08', '01,06'),
+                    (10, '01,08,50', '01,06,10'),
+                    (12, '01,08,50,50', '01,06,10,12'),
+                    (11, '01,08,75', '01,06,11'),
+                    (7, '01,04', '01,07'),
+                    (2, '02', '02'),
+                    (3, '02,09', '02,03'),
+                    (13, '02,09,06', '02,03,13'),
+                    (5, '02,01', '02,05'),
+                    (7, '02,04', '02,07'),
+                    (4, '04', '04'),
+                    (8, '08', '08'),
+                    (9, '09', '09'),
+                    (14, '14', '14'),
+                    (15, '15', '15')
+                )
+            )
+
+    def test_queryset_sortting_filter_node_distinct(self):
+        expected_nodes = (
+            (1, '0001',),
+            (5, '0001,0005'),
+            (6, '0001,0006'),
+            (10, '0001,0006,0010'),
+            (12, '0001,0006,0010,0012'),
+            (11, '0001,0006,0011'),
+            (7, '0001,0007'),
+            (2, '0002'),
+            (3, '0002,0003'),
+            (13, '0002,0003,0013'),
+            (4, '0004'),
+            (8, '0008'),
+            (9, '0009'),
+            (14, '0014'),
+            (15, '0015')
+        )
+        # The build is shared by both sort orders
+        with self.assertNumQueries(EDGE_SORT_BUILD_QUERIES):
+            qs = EdgeOrderedNode.objects.all()
+            qs_distinct = qs.with_sort_sequence(
+                padsize=2,
+            ).distinct_node(
+                'dag_node_path'
+            )
+        with self.subTest(msg="query sort order same as visit sort"):
+            qs_sorted = qs_distinct.order_by('dag_node_path')
+            with self.assertNumQueries(1):
+                rows = tuple(qs_sorted.values_list('pk', 'dag_node_path'))
+            self.assertEqual(
+                rows,
+                expected_nodes
+            )
+        with self.subTest(msg="query sort order reverse to filter order"):
+            # The descending order is applied in SQL alongside the distinct
+            # node filter, so this still fetches
+            qs_sorted = qs_distinct.order_by('-dag_node_path')
+            with self.assertNumQueries(1):
+                rows = tuple(qs_sorted.values_list('pk', 'dag_node_path'))
+            self.assertEqual(
+                rows,
+                tuple(reversed(expected_nodes))
+            )
+
+    def test_queryset_sortting_filter_node_distinct_returns_nodes(self):
+        qs = EdgeOrderedNode.objects.all()
+        qs_sorted = qs.with_sort_sequence(
+            padsize=2,
+        ).distinct_node('dag_node_path')
+        for node in qs_sorted:
+            self.assertIsInstance(node, EdgeOrderedNode)
+
+    def test_queryset_sortting_filter_node_distinct_without_sort(self):
+        qs = EdgeOrderedNode.objects.all()
+        with self.assertRaises(NotSupportedError):
+            list(qs.distinct_node('dag_node_path'))
+
+    def test_queryset_sortting_filter_breathfirst(self):
+        with self.subTest(msg="with no cloned nodes"):
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    padsize=2,
+                ).order_by('dag_depth', 'dag_sequence_path')
+                rows = tuple(
+                    map(
+                        lambda row: row[: 2],
+                        qs_sorted.values_list('pk', 'dag_sequence_path', 'dag_depth')
+                    )
+                )
+            self.assertEqual(
+                rows,
+                (
+                    (1, '01'),
+                    (2, '02'),
+                    (4, '04'),
+                    (8, '08'),
+                    (9, '09'),
+                    (14, '14'),
+                    (15, '15'),
+                    (7, '01,04'),
+                    (6, '01,08'),
+                    (5, '01,12'),
+                    (5, '02,01'),
+                    (7, '02,04'),
+                    (3, '02,09'),
+                    (10, '01,08,50'),
+                    (11, '01,08,75'),
+                    (13, '02,09,06'),
+                    (12, '01,08,50,50'),
+                )
+            )
+
+    def test_queryset_sortting_filter_pk_path(self):
+        with self.subTest(msg="with no cloned nodes"):
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_PK,
+                    padsize=2,
+                ).order_by('dag_pk_path')
+                rows = tuple(qs_sorted.values_list('pk', 'dag_pk_path'))
+            self.assertEqual(
+                rows,
+                (
+                    (1, '01',),
+                    (5, '01,05'),
+                    (6, '01,06'),
+                    (10, '01,06,10'),
+                    (12, '01,06,10,12'),
+                    (11, '01,06,11'),
+                    (7, '01,07'),
+                    (2, '02'),
+                    (3, '02,03'),
+                    (13, '02,03,13'),
+                    (5, '02,05'),
+                    (7, '02,07'),
+                    (4, '04'),
+                    (8, '08'),
+                    (9, '09'),
+                    (14, '14'),
+                    (15, '15')
+                )
+            )
+
+    def test_queryset_sortting_filter_default(self):
+        with self.subTest(msg="with no cloned nodes"):
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    padsize=2,
+                ).order_by('dag_sequence_path')
+                rows = tuple(qs_sorted.values_list('pk', 'dag_sequence_path'))
+            self.assertEqual(
+                rows,
+                (
+                    (1, '01'),
+                    (7, '01,04'),
+                    (6, '01,08'),
+                    (10, '01,08,50'),
+                    (12, '01,08,50,50'),
+                    (11, '01,08,75'),
+                    (5, '01,12'),
+                    (2, '02'),
+                    (5, '02,01'),
+                    (7, '02,04'),
+                    (3, '02,09'),
+                    (13, '02,09,06'),
+                    (4, '04'),
+                    (8, '08'),
+                    (9, '09'),
+                    (14, '14'),
+                    (15, '15')
+                )
+            )
+
+    def test_queryset_sortting_filter_depthfirst_preorder(self):
+        with self.subTest(msg="with no cloned nodes"):
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=2,
+                ).order_by('dag_sequence_path')
+                rows = tuple(qs_sorted.values_list('pk', 'dag_sequence_path'))
+            self.assertEqual(
+                rows,
+                (
+                    (1, '01'),
+                    (7, '01,04'),
+                    (6, '01,08'),
+                    (10, '01,08,50'),
+                    (12, '01,08,50,50'),
+                    (11, '01,08,75'),
+                    (5, '01,12'),
+                    (2, '02'),
+                    (5, '02,01'),
+                    (7, '02,04'),
+                    (3, '02,09'),
+                    (13, '02,09,06'),
+                    (4, '04'),
+                    (8, '08'),
+                    (9, '09'),
+                    (14, '14'),
+                    (15, '15')
+                )
+            )
+        with self.subTest(msg="with cloned nodes"):
+            self.nodes.p2.insert_child_after(self.nodes.p6, self.nodes.p5)
+            # Some backends build the sort paths when with_sort_sequence() is
+            # called, so the queryset is rebuilt after adding the edge
+            with self.assertNumQueries(EDGE_SORT_CLONED_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=2,
+                ).order_by('dag_sequence_path')
+                rows = tuple(qs_sorted.values_list('pk', 'dag_sequence_path'))
+            self.assertEqual(
+                rows,
+                (
+                    (1, '01'),
+                    (7, '01,04'),
+                    (6, '01,08'),
+                    (10, '01,08,50'),
+                    (12, '01,08,50,50'),
+                    (11, '01,08,75'),
+                    (5, '01,12'),
+                    (2, '02'),
+                    (5, '02,01'),
+                    (6, '02,02'),
+                    (10, '02,02,50'),
+                    (12, '02,02,50,50'),
+                    (11, '02,02,75'),
+                    (7, '02,04'),
+                    (3, '02,09'),
+                    (13, '02,09,06'),
+                    (4, '04'),
+                    (8, '08'),
+                    (9, '09'),
+                    (14, '14'),
+                    (15, '15')
+                )
+            )
 
-    def test_can_move_a_node_between_parents_beforestart(self):
-        self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
-        self.nodes.p9.move_node(
-            self.nodes.p2,
-            self.nodes.p1,
-            destination_sibling=self.nodes.p7,
-            position=Position.BEFORE
-        )
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p9.pk, self.nodes.p7.pk,
-                self.nodes.p6.pk, self.nodes.p5.pk]
-        )
+    def test_queryset_sortting_filter_depthfirst_postorder(self):
+        with self.subTest(msg="with no cloned nodes"):
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    padsize=2,
+                ).annotate(
+                    dag_postorder_path=RPad(
+                        Concat(
+                            Cast(F('dag_sequence_path'), output_field=TextField()),
+                            Value(','),
+                        ),
+                        (2 + 1) * 5,
+                        Value('A')
+                    )
+                ).order_by('dag_postorder_path')
+                rows = tuple(
+                    map(
+                        lambda row: row[: 2],
+                        qs_sorted.values_list('pk', 'dag_sequence_path', 'dag_postorder_path')
+                    )
+                )
+            self.assertEqual(
+                rows,
+                (
+                    (7, '01,04'),
+                    (12, '01,08,50,50'),
+                    (10, '01,08,50'),
+                    (11, '01,08,75'),
+                    (6, '01,08'),
+                    (5, '01,12'),
+                    (1, '01'),
+                    (5, '02,01'),
+                    (7, '02,04'),
+                    (13, '02,09,06'),
+                    (3, '02,09'),
+                    (2, '02'),
+                    (4, '04'),
+                    (8, '08'),
+                    (9, '09'),
+                    (14, '14'),
+                    (15, '15'),
+                )
+            )
 
-    def test_can_move_a_node_between_parents_afterend(self):
-        self.nodes.p2.add_child(self.nodes.p9, sequence=12)
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
-        self.nodes.p9.move_node(
-            self.nodes.p2,
-            self.nodes.p1,
-            destination_sibling=self.nodes.p5,
-            position=Position.AFTER
-        )
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p7.pk, self.nodes.p6.pk,
-                self.nodes.p5.pk, self.nodes.p9.pk]
-        )
+    @unittest.skip('no exception or test written as yet')
+    def test_queryset_sortting_filter_depthfirst_inorder(self):
+        pass
 
     def test_queryset_sortting_with_nosep(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
         with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                    padsize=3,
-                    padchar='0',
-                    sepchar=''
-            ).order_by('dag_node_path')
-            self.assertEqual(
-                tuple(
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                        padsize=3,
+                        padchar='0',
+                        sepchar=''
+                ).order_by('dag_node_path')
+                rows = tuple(
                     qs_sorted.values_list(
                         'pk',
                         'dag_sequence_path',
                         'dag_node_path',
                     )
-                ),
+                )
+            self.assertEqual(
+                rows,
                 (
                     (1, '001', '0001'),
                     (5, '001012', '0001,0005'),
@@ -967,32 +885,23 @@ class EdgeSortedDagRelationshipTests(TestCase):
             )
 
     def test_queryset_sortting_with_no_padding(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
         with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                    padsize=0,
-                    padchar='0',
-                    sepchar=','
-            ).order_by('dag_node_path')
-            self.assertEqual(
-                tuple(
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                        padsize=0,
+                        padchar='0',
+                        sepchar=','
+                ).order_by('dag_node_path')
+                rows = tuple(
                     qs_sorted.values_list(
                         'pk',
                         'dag_sequence_path',
                         'dag_node_path',
                     )
-                ),
+                )
+            self.assertEqual(
+                rows,
                 (
                     (1, '1', '0001'),
                     (5, '1,12', '0001,0005'),
@@ -1015,32 +924,23 @@ class EdgeSortedDagRelationshipTests(TestCase):
             )
 
     def test_queryset_sortting_with_neg_padding(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
         with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                    padsize=-3,
-                    padchar='0',
-                    sepchar=','
-            ).order_by('dag_node_path')
-            self.assertEqual(
-                tuple(
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                        padsize=-3,
+                        padchar='0',
+                        sepchar=','
+                ).order_by('dag_node_path')
+                rows = tuple(
                     qs_sorted.values_list(
                         'pk',
                         'dag_sequence_path',
                         'dag_node_path',
                     )
-                ),
+                )
+            self.assertEqual(
+                rows,
                 (
                     (1, '100', '0001'),
                     (5, '100,120', '0001,0005'),
@@ -1063,17 +963,6 @@ class EdgeSortedDagRelationshipTests(TestCase):
             )
 
     def test_queryset_sortting_with_custom_query(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
         class CustomQuerySet(EdgeOrderedNode.objects._queryset_class):
             path_padding_size = 2
             path_padding_char = ' '
@@ -1085,20 +974,22 @@ class EdgeSortedDagRelationshipTests(TestCase):
             objects = EdgeOrderedNode._default_manager.from_queryset(CustomQuerySet)()
 
         with self.subTest(msg="with no cloned nodes"):
-            qs = TestSortableCSModel.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                    padsize=3,
-                    padchar='0',
-                    sepchar=','
-            ).order_by('dag_node_path')
-            self.assertEqual(
-                tuple(
+            with self.assertNumQueries(EDGE_SORT_QUERIES):
+                qs = TestSortableCSModel.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                        padsize=3,
+                        padchar='0',
+                        sepchar=','
+                ).order_by('dag_node_path')
+                rows = tuple(
                     qs_sorted.values_list(
                         'pk',
                         'dag_sequence_path',
                         'dag_node_path',
                     )
-                ),
+                )
+            self.assertEqual(
+                rows,
                 (
                     (1, '001', ' 1'),
                     (5, '001,012', ' 1+ 5'),
@@ -1121,40 +1012,31 @@ class EdgeSortedDagRelationshipTests(TestCase):
             )
 
     def test_queryset_sortting_with_mixed_different_settings(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
         with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_PK,
-                padsize=2,
-                padchar='-',
-                sepchar='+',
-            )
-            qs_sorted = qs_sorted.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=3,
-                padchar='0',
-                sepchar='-',
-            ).order_by('dag_pk_path')
-            self.assertEqual(
-                tuple(
+            with self.assertNumQueries(EDGE_SORT_TWICE_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_PK,
+                    padsize=2,
+                    padchar='-',
+                    sepchar='+',
+                )
+                qs_sorted = qs_sorted.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=3,
+                    padchar='0',
+                    sepchar='-',
+                ).order_by('dag_pk_path')
+                rows = tuple(
                     qs_sorted.values_list(
                         'pk',
                         'dag_sequence_path',
                         'dag_pk_path',
                         'dag_node_path'
                     )
-                ),
+                )
+            self.assertEqual(
+                rows,
                 (
                     (1, '001', '-1', '0001'),
                     (5, '001-012', '-1+-5', '0001,0005'),
@@ -1177,41 +1059,32 @@ class EdgeSortedDagRelationshipTests(TestCase):
             )
 
     def test_queryset_sortting_with_double_used_different_settings(self):
-        for i in range(10, 16):
-            n = EdgeOrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
-        self.nodes.p6.insert_child_after(self.nodes.p10, None)
-        self.nodes.p6.insert_child_after(self.nodes.p11, self.nodes.p10)
-        self.nodes.p10.insert_child_after(self.nodes.p12, None)
-        self.nodes.p2.remove_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p3, sequence=9)
-        self.nodes.p3.add_child(self.nodes.p13, sequence=6)
-
         with self.subTest(msg="with no cloned nodes"):
-            qs = EdgeOrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=2,
-                padchar='-',
-                sepchar='+',
-                name='custom_path'
-            )
-            qs_sorted = qs_sorted.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=3,
-                padchar='0',
-                sepchar='-',
-            ).order_by('dag_node_path')
-            self.assertEqual(
-                tuple(
+            with self.assertNumQueries(EDGE_SORT_TWICE_QUERIES):
+                qs = EdgeOrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=2,
+                    padchar='-',
+                    sepchar='+',
+                    name='custom_path'
+                )
+                qs_sorted = qs_sorted.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=3,
+                    padchar='0',
+                    sepchar='-',
+                ).order_by('dag_node_path')
+                rows = tuple(
                     qs_sorted.values_list(
                         'pk',
                         'dag_sequence_path',
                         'custom_path',
                         'dag_node_path'
                     )
-                ),
+                )
+            self.assertEqual(
+                rows,
                 (
                     (1, '001', '-1', '0001'),
                     (5, '001-012', '-1+12', '0001,0005'),
@@ -1234,13 +1107,11 @@ class EdgeSortedDagRelationshipTests(TestCase):
             )
 
 
-class NodeSortedDagRelationshipTests(TestCase):
-    def setUp(self):
-        self.nodes = NodeStorage()
-        for i in range(1, 10):
-            n = OrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
+class NodeSortedDagRelationshipTests(NodeFixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.nodes = NodeStorage()
+        create_nodes(OrderedNode, cls.nodes, range(1, 10))
         # `-- <BasicNode: # 1>
         #     `-- <BasicNode: # 5 o=1 go=2 >
         #     `-- <BasicNode: # 4 o=2 go=6 >
@@ -1249,51 +1120,51 @@ class NodeSortedDagRelationshipTests(TestCase):
         #     `-- <BasicNode: # 6 o=1 go=1 >
         #     `-- <BasicNode: # 8 o=2 go=8 >
         #     `-- <BasicNode: # 7 o=3 go=11 >
-        self.nodes.p1.add_child(self.nodes.p3)
-        self.nodes.p1.add_child(self.nodes.p4)
-        self.nodes.p1.add_child(self.nodes.p5)
-        self.nodes.p2.add_child(self.nodes.p6)
-        self.nodes.p2.add_child(self.nodes.p7)
-        self.nodes.p2.add_child(self.nodes.p8)
-
-        self.nodes.p3.sequence = 12
-        self.nodes.p4.sequence = 6
-        self.nodes.p5.sequence = 2
-        self.nodes.p6.sequence = 1
-        self.nodes.p7.sequence = 11
-        self.nodes.p8.sequence = 8
-        for k, n in self.nodes.__dict__.items():
-            if k.startswith('p'):
-                n.save()
+        nodes = cls.nodes
+        NodeOrderedEdge.objects.bulk_create([
+            NodeOrderedEdge(parent=nodes.p1, child=nodes.p3),
+            NodeOrderedEdge(parent=nodes.p1, child=nodes.p4),
+            NodeOrderedEdge(parent=nodes.p1, child=nodes.p5),
+            NodeOrderedEdge(parent=nodes.p2, child=nodes.p6),
+            NodeOrderedEdge(parent=nodes.p2, child=nodes.p7),
+            NodeOrderedEdge(parent=nodes.p2, child=nodes.p8),
+        ])
+
+        cls.nodes.p3.sequence = 12
+        cls.nodes.p4.sequence = 6
+        cls.nodes.p5.sequence = 2
+        cls.nodes.p6.sequence = 1
+        cls.nodes.p7.sequence = 11
+        cls.nodes.p8.sequence = 8
+        OrderedNode.objects.bulk_update([
+            cls.nodes.p3, cls.nodes.p4, cls.nodes.p5,
+            cls.nodes.p6, cls.nodes.p7, cls.nodes.p8,
+        ], ['sequence'])
 
     def test_can_add_and_set_sequence(self):
         self.nodes.p1.add_child(self.nodes.p9, sequence=7)
         self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p5.pk, self.nodes.p4.pk,
-                self.nodes.p9.pk, self.nodes.p3.pk]
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p5.pk, self.nodes.p4.pk, self.nodes.p9.pk, self.nodes.p3.pk]
         )
 
     def test_queryset_sortting_filter(self):
-        for i in range(10, 16):
-            n = OrderedNode(name="%s" % i)
-            n.save()
-            setattr(self.nodes, "p%s" % i, n)
+        create_nodes(OrderedNode, self.nodes, range(10, 16))
         self.nodes.p4.insert_child_after(self.nodes.p10, None)
         self.nodes.p4.insert_child_after(self.nodes.p11, self.nodes.p10)
         self.nodes.p10.insert_child_after(self.nodes.p12, None)
         self.nodes.p7.insert_child_after(self.nodes.p13, None)
 
         with self.subTest(msg="with no cloned nodes"):
-            qs = OrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=2,
-            ).order_by('dag_sequence_path')
+            with self.assertNumQueries(NODE_SORT_QUERIES):
+                qs = OrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=2,
+                ).order_by('dag_sequence_path')
+                rows = tuple(qs_sorted.values_list('pk', 'dag_sequence_path'))
             self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_sequence_path')),
+                rows,
                 (
                     (1, '01'),
                     (5, '01,02'),
@@ -1314,13 +1185,15 @@ class NodeSortedDagRelationshipTests(TestCase):
             )
         with self.subTest(msg="with cloned nodes"):
             self.nodes.p6.insert_child_after(self.nodes.p10, None)
-            qs = OrderedNode.objects.all()
-            qs_sorted = qs.with_sort_sequence(
-                DagSortOrder.NODE_SEQUENCE,
-                padsize=2,
-            ).order_by('dag_sequence_path')
+            with self.assertNumQueries(NODE_SORT_CLONED_QUERIES):
+                qs = OrderedNode.objects.all()
+                qs_sorted = qs.with_sort_sequence(
+                    DagSortOrder.NODE_SEQUENCE,
+                    padsize=2,
+                ).order_by('dag_sequence_path')
+                rows = tuple(qs_sorted.values_list('pk', 'dag_sequence_path'))
             self.assertEqual(
-                tuple(qs_sorted.values_list('pk', 'dag_sequence_path')),
+                rows,
                 (
                     (1, '01'),
                     (5, '01,02'),
@@ -1362,11 +1235,15 @@ class NodeSortedDagRelationshipTests(TestCase):
             [('6', 1), ('5', 2), ('4', 6), ('8', 8), ('7', 11), ('3', 12)])
 
     def test_can_get_first_child_of_node(self):
-        self.assertEqual(self.nodes.p1.get_first_child(), self.nodes.p5)
+        with self.assertNumQueries(1):
+            first_child = self.nodes.p1.get_first_child()
+        self.assertEqual(first_child, self.nodes.p5)
         self.assertEqual(self.nodes.p2.get_first_child(), self.nodes.p6)
 
     def test_can_get_last_child_of_node(self):
-        self.assertEqual(self.nodes.p1.get_last_child(), self.nodes.p3)
+        with self.assertNumQueries(1):
+            last_child = self.nodes.p1.get_last_child()
+        self.assertEqual(last_child, self.nodes.p3)
         self.assertEqual(self.nodes.p2.get_last_child(), self.nodes.p7)
 
     def test_can_get_first_parent_of_node(self):
@@ -1376,12 +1253,15 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.save()
 
         self.nodes.p9.add_child(self.nodes.p4)
-        self.assertEqual(self.nodes.p4.get_first_parent(), self.nodes.p9)
+        with self.assertNumQueries(1):
+            first_parent = self.nodes.p4.get_first_parent()
+        self.assertEqual(first_parent, self.nodes.p9)
         self.nodes.p9.sequence = 20
         self.nodes.p9.save()
-        self.assertEqual(self.nodes.p4.get_first_parent(), self.nodes.p1)
+        first_parent = self.nodes.p4.get_first_parent()
+        self.assertEqual(first_parent, self.nodes.p1)
         self.assertEqual(
-            self.nodes.p4.get_first_parent(),
+            first_parent,
             self.nodes.p4.parents.with_sequence().order_by('sequence').first(),
         )
 
@@ -1392,36 +1272,37 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.save()
 
         self.nodes.p9.add_child(self.nodes.p4)
-        self.assertEqual(self.nodes.p4.get_last_parent(), self.nodes.p1)
+        with self.assertNumQueries(1):
+            last_parent = self.nodes.p4.get_last_parent()
+        self.assertEqual(last_parent, self.nodes.p1)
         self.nodes.p9.sequence = 20
         self.nodes.p9.save()
-        self.assertEqual(self.nodes.p4.get_last_parent(), self.nodes.p9)
+        last_parent = self.nodes.p4.get_last_parent()
+        self.assertEqual(last_parent, self.nodes.p9)
         self.assertEqual(
-            self.nodes.p4.get_last_parent(),
+            last_parent,
             self.nodes.p4.parents.with_sequence().order_by('sequence').last(),
         )
 
     def test_can_get_next_sibling_of_node(self):
-        self.assertEqual(
-            self.nodes.p5.get_next_sibling(self.nodes.p1),
-            self.nodes.p4)
-        self.assertEqual(self.nodes.p3.get_next_sibling(self.nodes.p1), None)
-        self.assertEqual(
-            self.nodes.p6.get_next_sibling(self.nodes.p2),
-            self.nodes.p8)
-        self.assertEqual(
-            self.nodes.p7.get_next_sibling(self.nodes.p2), None)
+        with self.assertNumQueries(1):
+            sibling = self.nodes.p5.get_next_sibling(self.nodes.p1)
+        self.assertEqual(sibling, self.nodes.p4)
+        with self.assertNumQueries(1):
+            sibling = self.nodes.p3.get_next_sibling(self.nodes.p1)
+        self.assertEqual(sibling, None)
+        self.assertEqual(self.nodes.p6.get_next_sibling(self.nodes.p2), self.nodes.p8)
+        self.assertEqual(self.nodes.p7.get_next_sibling(self.nodes.p2), None)
 
     def test_can_get_prev_sibling_of_node(self):
-        self.assertEqual(self.nodes.p5.get_prev_sibling(self.nodes.p1), None)
-        self.assertEqual(
-            self.nodes.p4.get_prev_sibling(self.nodes.p1),
-            self.nodes.p5)
-        self.assertEqual(
-            self.nodes.p8.get_prev_sibling(self.nodes.p2),
-            self.nodes.p6)
-        self.assertEqual(
-            self.nodes.p6.get_prev_sibling(self.nodes.p2), None)
+        with self.assertNumQueries(1):
+            sibling = self.nodes.p5.get_prev_sibling(self.nodes.p1)
+        self.assertEqual(sibling, None)
+        with self.assertNumQueries(1):
+            sibling = self.nodes.p4.get_prev_sibling(self.nodes.p1)
+        self.assertEqual(sibling, self.nodes.p5)
+        self.assertEqual(self.nodes.p8.get_prev_sibling(self.nodes.p2), self.nodes.p6)
+        self.assertEqual(self.nodes.p6.get_prev_sibling(self.nodes.p2), None)
 
     def test_cannot_move_a_node_between_parents_causing_circular_ref(self):
         self.nodes.p3.add_child(self.nodes.p9)
@@ -1437,41 +1318,27 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p2.add_child(self.nodes.p9)
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
         )
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
 
     def test_can_move_a_node_between_parents_first(self):
         self.nodes.p2.add_child(self.nodes.p9)
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
 
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             position=Position.FIRST
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).first(),
+            _ordered_child_pks(self.nodes.p1)[0],
             self.nodes.p9.pk
         )
 
@@ -1486,9 +1353,7 @@ class NodeSortedDagRelationshipTests(TestCase):
             position=Position.FIRST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).first(),
+            _ordered_child_pks(self.nodes.p1)[0],
             self.nodes.p9.pk
         )
 
@@ -1499,9 +1364,7 @@ class NodeSortedDagRelationshipTests(TestCase):
             position=Position.FIRST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).first(),
+            _ordered_child_pks(self.nodes.p1)[0],
             self.nodes.p9.pk
         )
 
@@ -1510,23 +1373,15 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
 
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             position=Position.LAST
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).last(),
+            _ordered_child_pks(self.nodes.p1)[-1],
             self.nodes.p9.pk
         )
 
@@ -1541,9 +1396,7 @@ class NodeSortedDagRelationshipTests(TestCase):
             position=Position.LAST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).last(),
+            _ordered_child_pks(self.nodes.p1)[-1],
             self.nodes.p9.pk
         )
 
@@ -1554,9 +1407,7 @@ class NodeSortedDagRelationshipTests(TestCase):
             position=Position.LAST
         )
         self.assertEqual(
-            self.nodes.p1.children
-                .with_sequence().order_by('sequence')
-                .values_list('pk', flat=True).last(),
+            _ordered_child_pks(self.nodes.p1)[-1],
             self.nodes.p9.pk
         )
 
@@ -1565,26 +1416,17 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
 
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             destination_sibling=self.nodes.p4,
             position=Position.BEFORE
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p5.pk, self.nodes.p9.pk,
-                self.nodes.p4.pk, self.nodes.p3.pk]
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p5.pk, self.nodes.p9.pk, self.nodes.p4.pk, self.nodes.p3.pk]
         )
 
     def test_can_move_a_node_before_a_sibling(self):
@@ -1599,11 +1441,8 @@ class NodeSortedDagRelationshipTests(TestCase):
             position=Position.BEFORE
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p6.pk, self.nodes.p8.pk,
-                self.nodes.p9.pk, self.nodes.p7.pk]
+            _ordered_child_pks(self.nodes.p2),
+            [self.nodes.p6.pk, self.nodes.p8.pk, self.nodes.p9.pk, self.nodes.p7.pk]
         )
 
     def test_can_move_a_node_before_a_sibling_quickapi(self):
@@ -1616,11 +1455,8 @@ class NodeSortedDagRelationshipTests(TestCase):
             self.nodes.p7,
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p6.pk, self.nodes.p8.pk,
-                self.nodes.p9.pk, self.nodes.p7.pk]
+            _ordered_child_pks(self.nodes.p2),
+            [self.nodes.p6.pk, self.nodes.p8.pk, self.nodes.p9.pk, self.nodes.p7.pk]
         )
 
     def test_can_move_a_node_between_parents_after(self):
@@ -1628,26 +1464,17 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
 
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             destination_sibling=self.nodes.p4,
             position=Position.AFTER
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p5.pk, self.nodes.p4.pk,
-                self.nodes.p9.pk, self.nodes.p3.pk]
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p5.pk, self.nodes.p4.pk, self.nodes.p9.pk, self.nodes.p3.pk]
         )
 
     def test_can_move_a_node_after_a_sibling(self):
@@ -1662,11 +1489,8 @@ class NodeSortedDagRelationshipTests(TestCase):
             position=Position.AFTER
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p6.pk, self.nodes.p8.pk,
-                self.nodes.p9.pk, self.nodes.p7.pk]
+            _ordered_child_pks(self.nodes.p2),
+            [self.nodes.p6.pk, self.nodes.p8.pk, self.nodes.p9.pk, self.nodes.p7.pk]
         )
 
     def test_can_move_a_node_after_a_sibling_quickapi(self):
@@ -1679,11 +1503,8 @@ class NodeSortedDagRelationshipTests(TestCase):
             self.nodes.p8,
         )
         self.assertEqual(
-            list(self.nodes.p2.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p6.pk, self.nodes.p8.pk,
-                self.nodes.p9.pk, self.nodes.p7.pk]
+            _ordered_child_pks(self.nodes.p2),
+            [self.nodes.p6.pk, self.nodes.p8.pk, self.nodes.p9.pk, self.nodes.p7.pk]
         )
 
     def test_can_move_a_node_between_parents_beforestart(self):
@@ -1691,26 +1512,17 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
 
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             destination_sibling=self.nodes.p5,
             position=Position.BEFORE
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p9.pk, self.nodes.p5.pk,
-                self.nodes.p4.pk, self.nodes.p3.pk]
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p9.pk, self.nodes.p5.pk, self.nodes.p4.pk, self.nodes.p3.pk]
         )
 
     def test_can_move_a_node_between_parents_afterend(self):
@@ -1718,24 +1530,15 @@ class NodeSortedDagRelationshipTests(TestCase):
         self.nodes.p9.sequence = 12
         self.nodes.p9.save()
 
-        self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p2.pk]
-        )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p2.pk])
         self.nodes.p9.move_node(
             self.nodes.p2,
             self.nodes.p1,
             destination_sibling=self.nodes.p3,
             position=Position.AFTER
         )
+        self.assertEqual(_parent_pks(self.nodes.p9), [self.nodes.p1.pk])
         self.assertEqual(
-            list(self.nodes.p9.parents.values_list('pk', flat=True)),
-            [self.nodes.p1.pk]
-        )
-        self.assertEqual(
-            list(self.nodes.p1.children
-                 .with_sequence().order_by('sequence')
-                 .values_list('pk', flat=True)),
-            [self.nodes.p5.pk, self.nodes.p4.pk,
-                self.nodes.p3.pk, self.nodes.p9.pk]
+            _ordered_child_pks(self.nodes.p1),
+            [self.nodes.p5.pk, self.nodes.p4.pk, self.nodes.p3.pk, self.nodes.p9.pk]
         )